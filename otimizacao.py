@@ -1,4 +1,11 @@
+import importlib.util
+import io
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import numpy as np # NumPy: Cálculo vetorizado (todas as espécies de uma vez)
 import pandas as pd # Panda: Biblioteca padrão para ler Excel/CSV
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
@@ -7,6 +14,82 @@ import pulp # PuLP: A biblioteca matemática que faz a "mágica" da otimização
 # ==============================================================================
 # 1. PARÂMETROS TÉCNICOS (LEITURA DO EXCEL)
 # ==============================================================================
+# "Traduz" os nomes das colunas do Excel (que tem acento e espaço)
+# para nomes de variáveis simples que usamos no Python (sem acento)
+MAPEAMENTO_COLUNAS = {
+    'Espécie': 'nome',
+    'Valor Mercado (R$/kg)': 'valor_mercado_kg',
+    'Peso Final Ideal (kg)': 'peso_final_ideal_kg',
+    'Peso Inicial (g)': 'peso_inicial_g',
+    'Taxa de Mortalidade': 'taxa_mortalidade',
+    'Densidade Máxima (kg/m³)': 'densidade_max_kg_m3',
+    'Conversão Alimentar': 'conversao_alimentar',
+    'Tempo Ciclo (meses)': 'tempo_ciclo_meses',
+    'Custo Alevino (R$/un)': 'custo_alevino_un',
+    'Custo Ração (R$/kg)': 'custo_racao_kg'
+}
+
+# Tipo de cada coluna, declarado de antemão (o pandas não precisa adivinhar).
+# Os números são todos float64, inclusive o Tempo de Ciclo: uma célula em
+# branco vira NaN em vez de impedir a leitura da planilha inteira.
+TIPOS_COLUNAS = {coluna: 'float64' for coluna in MAPEAMENTO_COLUNAS}
+TIPOS_COLUNAS['Espécie'] = 'string'
+
+# O leitor 'calamine' (escrito em Rust) é bem mais rápido que o openpyxl;
+# se não estiver instalado, usa o openpyxl mesmo
+MOTOR_EXCEL = 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+@lru_cache(maxsize=4)
+def _ler_planilha(caminho_arquivo, mtime):
+    """
+    Lê o Excel de fato. O resultado fica guardado em cache pela dupla
+    (caminho, data de modificação): enquanto o arquivo não mudar, não é
+    preciso abrir e interpretar o .xlsx de novo.
+    Entre execuções do programa, a tabela fica salva numa cópia '.parquet'
+    ao lado do Excel, que é muito mais rápida de ler. Se o Excel for mais
+    novo que a cópia (o produtor mudou algum preço), ele é lido de novo.
+    """
+    copia = Path(caminho_arquivo).with_suffix('.parquet')
+    if copia.exists() and copia.stat().st_mtime >= mtime:
+        try:
+            df = pd.read_parquet(copia)
+            # A cópia já guarda os nomes internos; se o mapeamento mudou
+            # desde que ela foi gravada, lê o Excel de novo
+            if list(df.columns) == list(MAPEAMENTO_COLUNAS.values()):
+                return df
+        except ImportError:
+            pass # Sem pyarrow: lê o Excel mesmo
+        except Exception:
+            # Cópia corrompida (ex.: gravação interrompida no meio): apaga,
+            # senão ela seria lida de novo a cada abertura do programa
+            _apagar_copia(copia)
+
+    # Só as colunas usadas são lidas. No openpyxl, o modo 'read_only' não
+    # monta a planilha inteira na memória.
+    opcoes = {}
+    if MOTOR_EXCEL == 'openpyxl':
+        opcoes['engine_kwargs'] = {'read_only': True, 'data_only': True}
+    df = pd.read_excel(caminho_arquivo, engine=MOTOR_EXCEL,
+                       usecols=list(MAPEAMENTO_COLUNAS), dtype=TIPOS_COLUNAS, **opcoes)
+    # Renomeia no próprio DataFrame (sem criar uma cópia da tabela)
+    df.rename(columns=MAPEAMENTO_COLUNAS, inplace=True)
+    try:
+        df.to_parquet(copia, compression='zstd')
+    except ImportError:
+        pass # Sem pyarrow: segue sem a cópia
+    except Exception:
+        # Pasta sem permissão de escrita ou falha no meio da gravação:
+        # segue sem a cópia e não deixa um arquivo pela metade para trás
+        _apagar_copia(copia)
+    return df
+
+def _apagar_copia(copia):
+    """Remove a cópia '.parquet' da planilha, se possível."""
+    try:
+        copia.unlink(missing_ok=True)
+    except OSError:
+        pass
+
 def ler_tabela(caminho_arquivo:str): 
     """
     Função para ler a planilha 'especies.xlsx'.
@@ -14,28 +97,29 @@ def ler_tabela(caminho_arquivo:str):
     sem precisar chamar o programador para mexer no código.
     """
     try:
-        df = pd.read_excel(caminho_arquivo)
-
-        # "Traduz" os nomes das colunas do Excel (que tem acento e espaço)
-        # para nomes de variáveis simples que usamos no Python (sem acento)
-        mapeamento_colunas = {
-            'Espécie': 'nome',
-            'Valor Mercado (R$/kg)': 'valor_mercado_kg',
-            'Peso Final Ideal (kg)': 'peso_final_ideal_kg',
-            'Peso Inicial (g)': 'peso_inicial_g',
-            'Taxa de Mortalidade': 'taxa_mortalidade',
-            'Densidade Máxima (kg/m³)': 'densidade_max_kg_m3',
-            'Conversão Alimentar': 'conversao_alimentar',
-            'Tempo Ciclo (meses)': 'tempo_ciclo_meses',
-            'Custo Alevino (R$/un)': 'custo_alevino_un',
-            'Custo Ração (R$/kg)': 'custo_racao_kg'
-        }
-        # Converte a tabela em uma lista de dicionários (mais rápido de processar)
-        especies_db = df.rename(columns=mapeamento_colunas).to_dict('records')
-        return especies_db
+        # A data de modificação entra na chave do cache: se o produtor salvar
+        # a planilha de novo, ela é relida automaticamente
+        df = _ler_planilha(caminho_arquivo, os.path.getmtime(caminho_arquivo))
     except Exception as e:
-        # Se der erro (arquivo não existe, etc), retorna lista vazia
-        return []
+        # Se der erro (arquivo não existe, etc), segue com uma tabela vazia
+        df = pd.DataFrame(columns=list(MAPEAMENTO_COLUNAS.values()), dtype=np.float64)
+
+    # Linha sem o nome da espécie não tem como aparecer no relatório: fica de fora
+    if df['nome'].isna().any():
+        df = df[df['nome'].notna()]
+
+    # Converte a tabela em um dicionário de colunas (um vetor NumPy por
+    # coluna, sem cópia): evita criar um dicionário Python para cada espécie.
+    # O DataFrame fica no cache e não é alterado daqui para frente.
+    especies_db = {col: df[col].to_numpy(copy=False) for col in df.columns}
+    especies_db['nome'] = df['nome'].to_numpy(dtype=object)
+
+    # Grandezas que só dependem da espécie (não da fazenda): calculadas uma
+    # única vez aqui e reaproveitadas pela simulação e pelo otimizador
+    especies_db['ganho_peso'] = especies_db['peso_final_ideal_kg'] - especies_db['peso_inicial_g'] / 1000
+    especies_db['consumo_racao_kg'] = especies_db['ganho_peso'] * especies_db['conversao_alimentar']
+    especies_db['custo_var_unit'] = especies_db['custo_alevino_un'] + especies_db['consumo_racao_kg'] * especies_db['custo_racao_kg']
+    return especies_db
 
 # ==============================================================================
 # 2. MODELO DA FAZENDA (ESTRUTURA DE DADOS)
@@ -70,193 +154,348 @@ class SistemaProdutivo:
 # ==============================================================================
 # 3. CORE DE CÁLCULO (SIMULAÇÃO INDIVIDUAL)
 # ==============================================================================
-def simular_cenarios(sis, especies_db):
+def _linhas_completas(num):
+    """Espécies sem nenhuma célula em branco (NaN) na planilha."""
+    return np.logical_and.reduce([np.isfinite(v) for v in num.values()])
+
+def _calcular_cenarios(sis, num):
+    """
+    Núcleo numérico da simulação: só recebe vetores float64 (um valor por
+    espécie) e devolve vetores. Cada conta é uma única operação do NumPy
+    sobre todas as espécies de uma vez (sem laço em Python).
+    As espécies inviáveis saem das contas assim que são identificadas; os
+    vetores devolvidos valem só para as viáveis, cujas posições na tabela
+    original vêm em 'indices'.
+    """
+    # --- 1. Custo Fixo Total do ciclo (Luz, funcionário x Meses) ---
+    custo_fixo_ciclo = sis.custo_fixo_mensal * num['tempo_ciclo_meses']
+
+    # Quanto dinheiro sobra pros peixes depois de pagar a luz (custo fixo)?
+    # Onde não sobra nada a espécie é INVIÁVEL e nem entra no resto das contas
+    # (assim como as espécies com alguma célula em branco na planilha)
+    orcamento_operacional = sis.capital_giro - custo_fixo_ciclo
+    indices = np.flatnonzero((orcamento_operacional > 0) & _linhas_completas(num))
+    if indices.size == 0:
+        return {'indices': indices}
+    num = {c: v[indices] for c, v in num.items()}
+    custo_fixo_ciclo = custo_fixo_ciclo[indices]
+    orcamento_operacional = orcamento_operacional[indices]
+
+    # --- 2. TETO FÍSICO (Restrição de Espaço) ---
+    # Quantos peixes cabem na água sem morrer por falta de oxigênio?
+    # As quantidades de peixes ficam em float64 já arredondadas para baixo
+    # (np.floor): nada de ir e voltar entre inteiro e float nas contas.
+    # Obs.: np.floor_divide não serve aqui, ele dá 10000 // 0.04 = 249999.
+    densidade_real_aplicada = num['densidade_max_kg_m3'] * sis.fator_sistema
+    biomassa_max = sis.volume_total * densidade_real_aplicada
+    max_fisico = np.floor(biomassa_max / num['peso_final_ideal_kg'])
+
+    # --- 3. TETO FINANCEIRO (Restrição de Orçamento) ---
+    # Quantos peixes consigo comprar e alimentar com o dinheiro que sobrou?
+    # (Custo Variável Unitário = Alevino + Comida, calculado na leitura da tabela)
+    max_financeiro = np.floor(orcamento_operacional / num['custo_var_unit'])
+
+    # --- 4. A DECISÃO (Lei do Mínimo) ---
+    # Produzimos o menor valor entre o que CABE e o que podemos PAGAR.
+    qtd_real = np.minimum(max_fisico, max_financeiro)
+
+    # Sem espaço ou dinheiro para 1 peixe sequer: também INVIÁVEL
+    viavel = np.flatnonzero(qtd_real > 0)
+    indices = indices[viavel]
+    num = {c: v[viavel] for c, v in num.items()}
+    custo_fixo_ciclo = custo_fixo_ciclo[viavel]
+    max_fisico = max_fisico[viavel]
+    max_financeiro = max_financeiro[viavel]
+    qtd_real = qtd_real[viavel]
+
+    peso_final = num['peso_final_ideal_kg']
+    tempo_ciclo = num['tempo_ciclo_meses']
+    valor_mercado = num['valor_mercado_kg']
+    consumo_racao_kg_por_peixe = num['consumo_racao_kg']
+
+    # --- 5. Consolidação dos Resultados (Output) ---
+    # Aplica a mortalidade para saber quantos chegam no final
+    peixes_finais = np.floor(qtd_real * (1 - num['taxa_mortalidade']))
+    biomassa_vendida_kg = peixes_finais * peso_final
+
+    investimento_alevinos = qtd_real * num['custo_alevino_un']
+    investimento_racao = qtd_real * consumo_racao_kg_por_peixe * num['custo_racao_kg']
+    custo_total_ciclo = investimento_alevinos + investimento_racao + custo_fixo_ciclo
+
+    receita_bruta = biomassa_vendida_kg * valor_mercado
+    lucro_liquido = receita_bruta - custo_total_ciclo
+
+    # Indicadores para tomada de decisão
+    ponto_equilibrio_kg = custo_total_ciclo / valor_mercado
+    roi = (lucro_liquido / custo_total_ciclo) * 100
+    lucro_mensal = lucro_liquido / tempo_ciclo # Normaliza para comparar ciclos diferentes
+    racao_total_ton = (qtd_real * consumo_racao_kg_por_peixe) / 1000
+    ocupacao = (qtd_real / max_fisico) * 100
+
+    # Só sobram duas divisões que podem ser por zero: o custo por kg (se
+    # nenhum peixe sobreviver) e o Payback (se não houver lucro). A divisão
+    # com 'where' só é feita onde o divisor é positivo; o resto fica em 0.
+    custo_producao_por_kg = np.divide(custo_total_ciclo, biomassa_vendida_kg,
+                                      out=np.zeros_like(custo_total_ciclo), where=biomassa_vendida_kg > 0)
+    payback_meses = np.divide(custo_total_ciclo, lucro_mensal,
+                              out=np.zeros_like(custo_total_ciclo), where=lucro_mensal > 0)
+
+    return {
+        'indices': indices,
+        'qtd_povoamento': qtd_real,
+        'biomassa_kg': biomassa_vendida_kg,
+        'custo_alevinos': investimento_alevinos,
+        'custo_racao': investimento_racao,
+        'custo_fixo': custo_fixo_ciclo,
+        'custo_total': custo_total_ciclo,
+        'custo_kg_produzido': custo_producao_por_kg,
+        'receita': receita_bruta,
+        'lucro_liquido': lucro_liquido,
+        'lucro_mensal': lucro_mensal,
+        'roi': roi,
+        'payback_meses': payback_meses,
+        'racao_ton': racao_total_ton,
+        'ocupacao': ocupacao,
+        # Define qual foi o limitador (Gargalo)
+        'gargalo_financeiro': max_financeiro < max_fisico,
+        'ponto_equilibrio': ponto_equilibrio_kg,
+    }
+
+def simular_cenarios(sis, especies_db, limite=None):
     """
     Testa cada espécie isoladamente (Monocultivo).
     Responde a pergunta: "E se eu colocar só Tilápia em tudo?"
+    Com 'limite', devolve só as 'limite' espécies de maior lucro mensal
+    (limite zero ou negativo: lista vazia).
     """
-    resultados = []
-    
-    for esp in especies_db:
-        # --- 1. Engenharia Reversa de Custos ---
-        # Calcula quanto o peixe cresce e quanta ração ele come no total
-        ganho_peso = esp['peso_final_ideal_kg'] - (esp['peso_inicial_g']/1000)
-        consumo_racao_kg_por_peixe = ganho_peso * esp['conversao_alimentar']
-        custo_alim_un = consumo_racao_kg_por_peixe * esp['custo_racao_kg']
-        
-        # Custo Variável Unitário: Quanto custa 1 peixe (Alevino + Comida)
-        custo_var_unit = esp['custo_alevino_un'] + custo_alim_un
-        # Custo Fixo Total do ciclo (Luz, funcionário x Meses)
-        custo_fixo_ciclo = sis.custo_fixo_mensal * esp['tempo_ciclo_meses']
-        
-        # --- 2. TETO FÍSICO (Restrição de Espaço) ---
-        # Quantos peixes cabem na água sem morrer por falta de oxigênio?
-        densidade_real_aplicada = esp['densidade_max_kg_m3'] * sis.fator_sistema
-        biomassa_max = sis.volume_total * densidade_real_aplicada
-        max_fisico = int(biomassa_max / esp['peso_final_ideal_kg'])
-        
-        # --- 3. TETO FINANCEIRO (Restrição de Orçamento) ---
-        # Quanto dinheiro sobra pros peixes depois de pagar a luz (custo fixo)?
-        orcamento_operacional = sis.capital_giro - custo_fixo_ciclo
-       
-        if orcamento_operacional <= 0:
-            resultados.append({'especie': esp['nome'], 'status': 'INVIÁVEL', 'motivo': 'Custo fixo excede capital.'})
-            continue
-            
-        # Quantos peixes consigo comprar e alimentar com o dinheiro que sobrou?
-        max_financeiro = int(orcamento_operacional / custo_var_unit)
-        
-        # --- 4. A DECISÃO (Lei do Mínimo) ---
-        # Produzimos o menor valor entre o que CABE e o que podemos PAGAR.
-        qtd_real = min(max_fisico, max_financeiro)
-        
-        if qtd_real <= 0:
-            resultados.append({'especie': esp['nome'], 'status': 'INVIÁVEL', 'motivo': 'Capital insuficiente.'})
-            continue
-
-        # --- 5. Consolidação dos Resultados (Output) ---
-        # Aplica a mortalidade para saber quantos chegam no final
-        peixes_finais = int(qtd_real * (1 - esp['taxa_mortalidade']))
-        biomassa_vendida_kg = peixes_finais * esp['peso_final_ideal_kg']
-        
-        investimento_alevinos = qtd_real * esp['custo_alevino_un']
-        investimento_racao = (qtd_real * consumo_racao_kg_por_peixe * esp['custo_racao_kg'])
-        custo_total_ciclo = investimento_alevinos + investimento_racao + custo_fixo_ciclo
-        
-        receita_bruta = biomassa_vendida_kg * esp['valor_mercado_kg']
-        lucro_liquido = receita_bruta - custo_total_ciclo
-        
-        # Indicadores para tomada de decisão
-        custo_producao_por_kg = custo_total_ciclo / biomassa_vendida_kg if biomassa_vendida_kg > 0 else 0
-        ponto_equilibrio_kg = custo_total_ciclo / esp['valor_mercado_kg']
-        roi = (lucro_liquido / custo_total_ciclo) * 100
-        lucro_mensal = lucro_liquido / esp['tempo_ciclo_meses'] # Normaliza para comparar ciclos diferentes
-        racao_total_ton = (qtd_real * consumo_racao_kg_por_peixe) / 1000
-        
-        # Cálculo do Payback
-        if lucro_mensal > 0:
-            payback_meses = custo_total_ciclo / lucro_mensal
-        else:
-            payback_meses = 0 
-
-        ocupacao = (qtd_real / max_fisico) * 100
-        
-        # Define qual foi o limitador (Gargalo)
-        gargalo = "FINANCEIRO" if max_financeiro < max_fisico else "FÍSICO"
-
-        resultados.append({
-            'especie': esp['nome'],
-            'dados_tec': esp,
-            'qtd_povoamento': qtd_real,
-            'biomassa_kg': biomassa_vendida_kg,
-            'custo_alevinos': investimento_alevinos,
-            'custo_racao': investimento_racao,
-            'custo_fixo': custo_fixo_ciclo,
-            'custo_total': custo_total_ciclo,
-            'custo_kg_produzido': custo_producao_por_kg,
-            'receita': receita_bruta,
-            'lucro_liquido': lucro_liquido,
-            'lucro_mensal': lucro_mensal,
-            'roi': roi,
-            'payback_meses': payback_meses, 
-            'racao_ton': racao_total_ton,
-            'ocupacao': ocupacao,
-            'gargalo': gargalo,
-            'ponto_equilibrio': ponto_equilibrio_kg,
-            'status': 'VIÁVEL'
-        })
-
-    # Ordena a lista: Quem dá mais lucro mensal aparece primeiro
-    return sorted([r for r in resultados if r['status']=='VIÁVEL'], key=lambda x: x['lucro_mensal'], reverse=True)
+    if limite is not None:
+        limite = int(limite)
+        if limite <= 0:
+            return []
+    # Passa só vetores float64 para o núcleo numérico (nada de pandas)
+    num = {c: v.astype(np.float64, copy=False) for c, v in especies_db.items() if c != 'nome'}
+    r = _calcular_cenarios(sis, num)
+    if r['indices'].size == 0:
+        return [] # Nenhuma espécie viável
+
+    # Ordena: Quem dá mais lucro mensal aparece primeiro (só as viáveis).
+    # Os dicionários só são montados aqui, no final, para a interface.
+    # 'k' é a posição nos vetores do resultado; 'i', a posição na tabela.
+    # Com 'limite', corta a lista já ordenada: em caso de empate no lucro,
+    # fica quem vem primeiro na planilha (igual à lista completa)
+    ordem = np.argsort(-r['lucro_mensal'], kind='stable')[:limite]
+    return [{
+        'especie': especies_db['nome'][i],
+        'dados_tec': {c: v[i] for c, v in especies_db.items()},
+        'qtd_povoamento': int(r['qtd_povoamento'][k]),
+        'biomassa_kg': float(r['biomassa_kg'][k]),
+        'custo_alevinos': float(r['custo_alevinos'][k]),
+        'custo_racao': float(r['custo_racao'][k]),
+        'custo_fixo': float(r['custo_fixo'][k]),
+        'custo_total': float(r['custo_total'][k]),
+        'custo_kg_produzido': float(r['custo_kg_produzido'][k]),
+        'receita': float(r['receita'][k]),
+        'lucro_liquido': float(r['lucro_liquido'][k]),
+        'lucro_mensal': float(r['lucro_mensal'][k]),
+        'roi': float(r['roi'][k]),
+        'payback_meses': float(r['payback_meses'][k]),
+        'racao_ton': float(r['racao_ton'][k]),
+        'ocupacao': float(r['ocupacao'][k]),
+        'gargalo': "FINANCEIRO" if r['gargalo_financeiro'][k] else "FÍSICO",
+        'ponto_equilibrio': float(r['ponto_equilibrio'][k]),
+        'status': 'VIÁVEL'
+    } for k, i in zip(ordem, r['indices'][ordem])]
 
 # ==============================================================================
 # 3.1 CORE DE OTIMIZAÇÃO (MIX + META MÍNIMA)
 # ==============================================================================
-def otimizar_mix_ideal(sis, especies_db, meta_minima_kg=0):
+# Solvers aceitos, na ordem de preferência (o mais rápido primeiro).
+# O CBC vem junto com o PuLP, então é sempre a última opção.
+# 'warm' = partida a quente: o solver começa da solução da rodada anterior.
+SOLVERS = {
+    'GUROBI': lambda warm: pulp.GUROBI_CMD(msg=0, timeLimit=10, warmStart=warm),
+    'HIGHS': lambda warm: pulp.HiGHS_CMD(msg=0, warmStart=warm),
+    'CBC': lambda warm: pulp.PULP_CBC_CMD(msg=0, threads=os.cpu_count(), warmStart=warm),
+}
+
+@lru_cache(maxsize=None)
+def _nome_solver(preferido):
     """
-    Usa Programação Linear (Simplex via PuLP) para achar a mistura perfeita de peixes.
-    Diferente da simulação acima, aqui o algoritmo tenta combinar espécies
-    para usar cada centavo e cada metro cúbico disponível.
+    Descobre (uma única vez para cada valor de AQUI_SOLVER) qual solver
+    instalado usar. Checar se o solver está disponível pode abrir um processo
+    (o Gurobi confere a licença), então isso não é repetido a cada solve.
+    """
+    ordem = [preferido] if preferido in SOLVERS else []
+    ordem += [nome for nome in SOLVERS if nome not in ordem]
+    for nome in ordem:
+        if SOLVERS[nome](False).available():
+            return nome
+    return 'CBC'
+
+def _escolher_solver(warm_start=False):
+    """
+    Escolhe o solver instalado mais rápido.
+    A variável de ambiente AQUI_SOLVER (GUROBI, HIGHS ou CBC) passa o
+    solver pedido para a frente da fila; se ele não estiver instalado,
+    segue a ordem padrão.
+    """
+    nome = _nome_solver(os.environ.get('AQUI_SOLVER', '').upper())
+    return SOLVERS[nome](warm_start)
+
+def _quantidades(vars_list):
+    """
+    Quantidades de peixes da solução. O solver devolve inteiros com folga
+    de ponto flutuante (ex.: 8.9999999), por isso o arredondamento.
+    """
+    return np.array([round(v.varValue or 0) for v in vars_list], dtype=np.float64)
+
+@lru_cache(maxsize=8)
+def _variaveis_decisao(nomes):
+    """
+    Cria as variáveis de decisão (uma por espécie) uma única vez para cada
+    conjunto de espécies; as rodadas seguintes reaproveitam os mesmos objetos.
+    Limites e tipo são redefinidos por quem monta o modelo.
+    'nomes' é uma tupla (para servir de chave do cache), mas vai como lista:
+    o PuLP entende uma tupla como índices de várias dimensões.
+    """
+    return pulp.LpVariable.dicts("Qtd", list(nomes), lowBound=0, cat='Integer')
+
+def _montar_modelo(sis, especies_db):
+    """
+    Monta o modelo de Programação Linear do mix para uma fazenda.
+    A meta mínima entra como a restrição 'meta' com lado direito 0, para
+    poder ser trocada depois sem remontar o modelo.
     """
-    model_data = []
     orcamento_operacional = sis.capital_giro
-    
+
     # Prepara os dados para o formato que o Solver entende
-    for esp in especies_db:
-        # Recalcula custos variáveis (igual à função anterior)
-        ganho_peso = esp['peso_final_ideal_kg'] - (esp['peso_inicial_g']/1000)
-        consumo_racao = ganho_peso * esp['conversao_alimentar']
-        custo_alim_un = consumo_racao * esp['custo_racao_kg']
-        custo_var_unit = esp['custo_alevino_un'] + custo_alim_un
-        
-        # Calcula limites físicos
-        densidade_real = esp['densidade_max_kg_m3'] * sis.fator_sistema
-        biomassa_max = sis.volume_total * densidade_real
-        max_fisico = int(biomassa_max / esp['peso_final_ideal_kg'])
-        
-        # Estima Lucro Unitário (Margem de Contribuição)
-        receita_un = esp['peso_final_ideal_kg'] * esp['valor_mercado_kg']
-        custo_fixo_rateado = (sis.custo_fixo_mensal * esp['tempo_ciclo_meses']) / max_fisico if max_fisico > 0 else 0
-        lucro_un = receita_un - custo_var_unit - custo_fixo_rateado
-        
-        if max_fisico > 0:
-            model_data.append({
-                'nome': esp['nome'],
-                'lucro_un': lucro_un,
-                'custo_un': custo_var_unit,
-                'peso_final': esp['peso_final_ideal_kg'],
-                'tempo_ciclo': esp['tempo_ciclo_meses'],
-                'max_fisico': max_fisico
-            })
+    # (custos unitários já vêm calculados da leitura da tabela)
+    num = {c: v.astype(np.float64, copy=False) for c, v in especies_db.items() if c != 'nome'}
+    custo_var_unit = num['custo_var_unit']
+
+    # Calcula limites físicos
+    densidade_real = num['densidade_max_kg_m3'] * sis.fator_sistema
+    biomassa_max = sis.volume_total * densidade_real
+    max_fisico_todos = np.floor(biomassa_max / num['peso_final_ideal_kg'])
+
+    # Só entram no modelo as espécies que cabem no tanque e que estão com
+    # todos os dados preenchidos na planilha
+    cabe = (max_fisico_todos > 0) & _linhas_completas(num)
+    nomes = list(especies_db['nome'][cabe])
+    max_fisico = max_fisico_todos[cabe]
+    custo_un = custo_var_unit[cabe]
+    peso_final = num['peso_final_ideal_kg'][cabe]
+    tempo_ciclo = especies_db['tempo_ciclo_meses'][cabe]
+
+    # Estima Lucro Unitário (Margem de Contribuição)
+    receita_un = peso_final * num['valor_mercado_kg'][cabe]
+    custo_fixo_rateado = (sis.custo_fixo_mensal * num['tempo_ciclo_meses'][cabe]) / max_fisico
+    lucro_un = receita_un - custo_un - custo_fixo_rateado
 
     # --- INÍCIO DO MODELO MATEMÁTICO (PULP) ---
     prob = pulp.LpProblem("Mix_Aquicultura", pulp.LpMaximize)
     
-    # Variáveis de Decisão: Quantidade de peixes de cada tipo (inteiro)
-    peixes_vars = pulp.LpVariable.dicts("Qtd", [m['nome'] for m in model_data], lowBound=0, cat='Integer')
+    # Variáveis de Decisão: Quantidade de peixes de cada tipo (inteira).
+    # A relaxação linear arredondada não compensa aqui: com poucos peixes
+    # por espécie (ex.: 9 Pirarucus) ela perde lucro e o modelo acaba
+    # resolvido duas vezes; o custo do solve é quase todo abrir o solver.
+    peixes_vars = _variaveis_decisao(tuple(sorted(nomes)))
+    # Lista na mesma ordem dos vetores de coeficientes: as expressões são
+    # montadas direto dos pares (variável, coeficiente), sem lpSum
+    vars_list = [peixes_vars[n] for n in nomes]
+    # As variáveis podem vir de uma rodada anterior: redefine limites e tipo
+    # (ninguém passa do que cabe no tanque com aquela espécie sozinha)
+    for v, limite in zip(vars_list, max_fisico.tolist()):
+        v.lowBound = 0
+        v.upBound = limite
+        v.cat = pulp.LpInteger
+
+    def expressao(coeficientes):
+        return pulp.LpAffineExpression(list(zip(vars_list, coeficientes.tolist())))
 
     # Função Objetivo: Maximizar o Lucro Total
-    prob += pulp.lpSum([m['lucro_un'] * peixes_vars[m['nome']] for m in model_data])
+    prob += expressao(lucro_un)
     
     # Restrição 1: Não gastar mais do que o orçamento
-    prob += pulp.lpSum([m['custo_un'] * peixes_vars[m['nome']] for m in model_data]) <= orcamento_operacional
+    prob += expressao(custo_un) <= orcamento_operacional
     
     # Restrição 2: Não lotar o tanque acima de 100% da capacidade
     # (Soma das frações de ocupação de cada espécie)
-    prob += pulp.lpSum([(peixes_vars[m['nome']] / m['max_fisico']) for m in model_data]) <= 1.0
+    prob += expressao(1 / max_fisico) <= 1.0
     
-    # Restrição 3: Atingir a Meta Mínima (se houver)
-    if meta_minima_kg > 0:
-        prob += pulp.lpSum([peixes_vars[m['nome']] * m['peso_final'] for m in model_data]) >= meta_minima_kg
+    # Restrição 3: Atingir a Meta Mínima (o valor é ajustado a cada rodada)
+    prob += expressao(peso_final) >= 0, 'meta'
+
+    return {
+        'prob': prob,
+        'vars': vars_list,
+        'nomes': nomes,
+        'lucro_un': lucro_un,
+        'custo_un': custo_un,
+        'peso_final': peso_final,
+        'tempo_ciclo': tempo_ciclo,
+        'max_fisico': max_fisico,
+    }
+
+# Último modelo montado. Na interface, o produtor costuma clicar de novo
+# mudando só a meta mínima: aí o mesmo modelo é reaproveitado.
+_modelo_anterior = None
+
+def _obter_modelo(sis, especies_db):
+    """
+    Devolve o modelo da fazenda e se ele foi reaproveitado da rodada anterior.
+    """
+    global _modelo_anterior
+    chave = (sis.capital_giro, sis.custo_fixo_mensal, sis.volume_total, sis.fator_sistema)
+    anterior = _modelo_anterior
+    if anterior is not None and anterior['db'] is especies_db and anterior['chave'] == chave:
+        return anterior, True
+    modelo = _montar_modelo(sis, especies_db)
+    modelo['db'] = especies_db
+    modelo['chave'] = chave
+    _modelo_anterior = modelo
+    return modelo, False
 
-    # Resolve o problema
-    prob.solve(pulp.PULP_CBC_CMD(msg=0)) 
+def otimizar_mix_ideal(sis, especies_db, meta_minima_kg=0):
+    """
+    Usa Programação Linear (Simplex via PuLP) para achar a mistura perfeita de peixes.
+    Diferente da simulação acima, aqui o algoritmo tenta combinar espécies
+    para usar cada centavo e cada metro cúbico disponível.
+    """
+    modelo, reaproveitado = _obter_modelo(sis, especies_db)
+    prob = modelo['prob']
+    vars_list = modelo['vars']
+    nomes = modelo['nomes']
+    lucro_un = modelo['lucro_un']
+    custo_un = modelo['custo_un']
+    peso_final = modelo['peso_final']
+    tempo_ciclo = modelo['tempo_ciclo']
+    max_fisico = modelo['max_fisico']
+
+    # Só a meta muda entre rodadas: troca o lado direito da restrição
+    prob.constraints['meta'].changeRHS(max(meta_minima_kg, 0))
+
+    # Resolve o problema (partindo da solução anterior, se houver)
+    prob.solve(_escolher_solver(warm_start=reaproveitado))
+    status = pulp.LpStatus[prob.status]
 
     # Recupera e processa os resultados
-    status = pulp.LpStatus[prob.status]
     if status == 'Optimal':
-        lucro_total = pulp.value(prob.objective)
-        custo_total_mix = 0
-        mix = []
-        biomassa_total = 0
-        max_ciclo = 0
-        
-        for m in model_data:
-            qtd = peixes_vars[m['nome']].varValue
-            if qtd > 0:
-                peso = qtd * m['peso_final']
-                custo = qtd * m['custo_un']
-                custo_total_mix += custo
-                biomassa_total += peso
-                if m['tempo_ciclo'] > max_ciclo: max_ciclo = m['tempo_ciclo']
-                
-                mix.append({
-                    'especie': m['nome'], 
-                    'qtd': int(qtd), 
-                    'peso': peso, 
-                    'ciclo': m['tempo_ciclo'], 
-                    'ocupacao': (qtd/m['max_fisico'])*100
-                })
+        qtds = _quantidades(vars_list)
+        lucro_total = float(lucro_un @ qtds)
+        # Totais do mix direto dos vetores, na mesma ordem das variáveis
+        custo_total_mix = float(custo_un @ qtds)
+        biomassa_total = float(peso_final @ qtds)
+        escolhidos = np.flatnonzero(qtds > 0)
+        max_ciclo = tempo_ciclo[escolhidos].max() if escolhidos.size else 0
+
+        mix = [{
+            'especie': nomes[j], 
+            'qtd': int(qtds[j]), 
+            'peso': qtds[j] * peso_final[j], 
+            'ciclo': tempo_ciclo[j], 
+            'ocupacao': (qtds[j]/max_fisico[j])*100
+        } for j in escolhidos]
         
         # Ajuste de Payback para o Mix
         custo_total_mix_final = custo_total_mix + (sis.custo_fixo_mensal * max_ciclo)
@@ -276,8 +515,12 @@ def otimizar_mix_ideal(sis, especies_db, meta_minima_kg=0):
         return {'status': 'ERRO', 'motivo': 'Erro numérico.'}
 
 
-def fmt_moeda(valor): return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-def fmt_num(valor): return f"{valor:,.0f}".replace(",", ".")
+# Formato brasileiro: troca ',' por '.' e '.' por ',' numa única passada
+# (o translate faz as duas trocas ao mesmo tempo, sem caractere temporário)
+_TABELA_BR = str.maketrans(',.', '.,')
+
+def fmt_moeda(valor): return "R$ " + f"{valor:,.2f}".translate(_TABELA_BR)
+def fmt_num(valor): return f"{valor:,.0f}".translate(_TABELA_BR)
 
 # ==============================================================================
 # 5. INTERFACE GRÁFICA (TKINTER)
@@ -290,6 +533,11 @@ class OtimizacaoApp:
 
         # Carrega o banco de dados na inicialização
         self.especies_db = ler_tabela(db)
+        # Simulação e otimização rodam fora da thread da interface
+        # (o CBC é um processo à parte), assim a janela não congela
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.fechada = False
+        self.root.protocol("WM_DELETE_WINDOW", self._fechar)
 
         main_frame = ttk.Frame(root, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -320,7 +568,8 @@ class OtimizacaoApp:
         ttk.Radiobutton(sistema_frame, text="SEMI-INTENSIVO", variable=self.sistema_var, value=2).pack(anchor=tk.W)
         ttk.Radiobutton(sistema_frame, text="INTENSIVO", variable=self.sistema_var, value=3).pack(anchor=tk.W)
         
-        ttk.Button(main_frame, text="3. Processar Simulação Completa", command=self.run_simulation).pack(pady=10, fill=tk.X)
+        self.processar_btn = ttk.Button(main_frame, text="3. Processar Simulação Completa", command=self.run_simulation)
+        self.processar_btn.pack(pady=10, fill=tk.X)
 
         results_frame = ttk.LabelFrame(main_frame, text="4. Relatório Detalhado + Estratégia", padding="10")
         results_frame.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -346,97 +595,152 @@ class OtimizacaoApp:
             
             # Instancia o "gêmeo digital" da fazenda
             sis = SistemaProdutivo(capital, qtd_tanques, vol_tanque, custo_fixo, self.sistema_var.get())
-            # Roda a simulação heurística
-            ranking = simular_cenarios(sis,self.especies_db)
-            # Gera o texto na tela
-            self.gerar_relatorio_gui(sis, ranking, meta_kg)
+        except ValueError:
+            messagebox.showerror("Erro", "Verifique os números digitados.")
+            return
 
-        except ValueError: messagebox.showerror("Erro", "Verifique os números digitados.")
+        # Roda as contas em segundo plano; o resultado volta para a thread
+        # da interface pelo root.after (o Tkinter só pode ser mexido por ela)
+        self.processar_btn.config(state=tk.DISABLED)
+        fut = self.executor.submit(self._calcular, sis, meta_kg)
+        fut.add_done_callback(lambda f: self._ao_terminar(f, sis, meta_kg))
 
-    def gerar_relatorio_gui(self, sis, ranking, meta_kg):
-        self.results_text.config(state=tk.NORMAL)
-        self.results_text.delete(1.0, tk.END)
+    def _ao_terminar(self, fut, sis, meta_kg):
+        # Roda na thread de cálculo: se a janela já foi fechada, não há
+        # para onde mandar o resultado
+        if self.fechada:
+            return
+        try:
+            self.root.after(0, self._exibir_resultado, fut, sis, meta_kg)
+        except (RuntimeError, tk.TclError):
+            pass # Janela fechada enquanto o resultado era entregue
+
+    def _fechar(self):
+        # Descarta os cálculos que ainda estão na fila e fecha a janela
+        # sem esperar o solver terminar
+        self.fechada = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
+    def _calcular(self, sis, meta_kg):
+        # Roda a simulação heurística
+        ranking = simular_cenarios(sis, self.especies_db)
+        # Chama a função de Otimização (Simplex) só se houver cenário viável
+        opt = otimizar_mix_ideal(sis, self.especies_db, meta_kg) if ranking else None
+        return ranking, opt
+
+    def _exibir_resultado(self, fut, sis, meta_kg):
+        self.processar_btn.config(state=tk.NORMAL)
+        try:
+            ranking, opt = fut.result()
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha no cálculo: {e}")
+            return
+        # Gera o texto na tela
+        self.gerar_relatorio_gui(sis, ranking, opt, meta_kg)
+
+    def gerar_relatorio_gui(self, sis, ranking, opt, meta_kg):
+        # O relatório é montado primeiro em memória (texto + faixas de cada
+        # tag) e vai para a tela de uma vez só, no final: cada insert no
+        # widget é uma ida e volta ao Tcl/Tk e um novo cálculo de layout
+        buf = io.StringIO()
+        marcas = []  # (tag, início, fim), em caracteres desde o começo do texto
+        pos = 0
+
+        def escrever(texto, tag=None):
+            nonlocal pos
+            buf.write(texto)
+            if tag:
+                marcas.append((tag, pos, pos + len(texto)))
+            pos += len(texto)
 
         if not ranking:
-            self.results_text.insert(tk.END, "NENHUM CENÁRIO VIÁVEL.\n", "negative")
+            escrever("NENHUM CENÁRIO VIÁVEL.\n", "negative")
+            self._mostrar_relatorio(buf.getvalue(), marcas)
             return
 
         # ======================================================================
         # PARTE 1: O RELATÓRIO "DIDÁTICO"
         # ======================================================================
-        self.results_text.insert(tk.END, f"{'='*80}\n", "title")
-        self.results_text.insert(tk.END, f"{' RANKING GERAL DE VIABILIDADE (MONOCULTIVO) ':^80}\n", "title")
-        self.results_text.insert(tk.END, f"{'='*80}\n", "title")
-        self.results_text.insert(tk.END, f"{'RK':<3} {'ESPÉCIE':<25} {'LUCRO MENSAL':<18} {'ROI':<10} {'INVESTIMENTO'}\n", "header")
-        self.results_text.insert(tk.END, f"{'-'*80}\n", "normal")
+        escrever(f"{'='*80}\n", "title")
+        escrever(f"{' RANKING GERAL DE VIABILIDADE (MONOCULTIVO) ':^80}\n", "title")
+        escrever(f"{'='*80}\n", "title")
+        escrever(f"{'RK':<3} {'ESPÉCIE':<25} {'LUCRO MENSAL':<18} {'ROI':<10} {'INVESTIMENTO'}\n", "header")
+        escrever(f"{'-'*80}\n", "normal")
         
         for i, cen in enumerate(ranking):
             tag = "highlight" if cen['lucro_mensal'] > 0 else "negative"
-            self.results_text.insert(tk.END, f"{i+1:02d}. {cen['especie']:<25} {fmt_moeda(cen['lucro_mensal']):<18} {cen['roi']:>5.1f}%    {fmt_moeda(cen['custo_total'])}\n", "normal")
-        self.results_text.insert(tk.END, "\n")
+            escrever(f"{i+1:02d}. {cen['especie']:<25} {fmt_moeda(cen['lucro_mensal']):<18} {cen['roi']:>5.1f}%    {fmt_moeda(cen['custo_total'])}\n", "normal")
+        escrever("\n")
 
         for cen in ranking:
             esp = cen['dados_tec']
             if cen['lucro_mensal'] < 0:
-                self.results_text.insert(tk.END, f"{'='*80}\n INVIÁVEL: {cen['especie']}\n{'='*80}\n", "title")
-                self.results_text.insert(tk.END, f" Prejuízo Mensal: {fmt_moeda(abs(cen['lucro_mensal']))}\n\n", "negative")
+                escrever(f"{'='*80}\n INVIÁVEL: {cen['especie']}\n{'='*80}\n", "title")
+                escrever(f" Prejuízo Mensal: {fmt_moeda(abs(cen['lucro_mensal']))}\n\n", "negative")
                 continue 
             
-            self.results_text.insert(tk.END, f"{'='*80}\n", "title")
-            self.results_text.insert(tk.END, f" ANÁLISE DETALHADA: {cen['especie'].upper()}\n", "title")
-            self.results_text.insert(tk.END, f"{'='*80}\n", "title")
-
-            self.results_text.insert(tk.END, f"\n1. RESUMO DE RESULTADOS\n{'-'*80}\n", "header")
-            self.results_text.insert(tk.END, f"   • Lucro Líquido Total: {fmt_moeda(cen['lucro_liquido'])} ", "highlight")
-            self.results_text.insert(tk.END, f"(Ciclo de {esp['tempo_ciclo_meses']} meses)\n", "highlight")
-            self.results_text.insert(tk.END, f"   • Lucro Mensal (Méd):  {fmt_moeda(cen['lucro_mensal'])}\n", "normal")
+            escrever(f"{'='*80}\n", "title")
+            escrever(f" ANÁLISE DETALHADA: {cen['especie'].upper()}\n", "title")
+            escrever(f"{'='*80}\n", "title")
+
+            escrever(f"\n1. RESUMO DE RESULTADOS\n{'-'*80}\n", "header")
+            escrever(f"   • Lucro Líquido Total: {fmt_moeda(cen['lucro_liquido'])} ", "highlight")
+            escrever(f"(Ciclo de {esp['tempo_ciclo_meses']:.0f} meses)\n", "highlight")
+            escrever(f"   • Lucro Mensal (Méd):  {fmt_moeda(cen['lucro_mensal'])}\n", "normal")
             
-            self.results_text.insert(tk.END, f"   • Payback (Retorno):   {cen['payback_meses']:.1f} meses (Tempo p/ recuperar 100% do capital via lucro)\n", "normal")
+            escrever(f"   • Payback (Retorno):   {cen['payback_meses']:.1f} meses (Tempo p/ recuperar 100% do capital via lucro)\n", "normal")
             
-            self.results_text.insert(tk.END, f"   • ROI:                 {cen['roi']:.1f}%\n", "normal")
-            self.results_text.insert(tk.END, f"   • Custo Prod.:         {fmt_moeda(cen['custo_kg_produzido'])}/kg (Venda: {fmt_moeda(esp['valor_mercado_kg'])})\n", "normal")
-
-            self.results_text.insert(tk.END, f"\n2. ORÇAMENTO (DESTINAÇÃO DO CAPITAL)\n{'-'*80}\n", "header")
-            self.results_text.insert(tk.END, f"   • Alevinos:            {fmt_num(cen['qtd_povoamento'])} un. -> {fmt_moeda(cen['custo_alevinos'])}\n", "normal")
-            self.results_text.insert(tk.END, f"   • Ração:               {cen['racao_ton']:.2f} ton -> {fmt_moeda(cen['custo_racao'])}\n", "normal")
-            self.results_text.insert(tk.END, f"   • Custo Fixo:          {fmt_moeda(cen['custo_fixo'])}\n", "normal")
-            self.results_text.insert(tk.END, f"   ► TOTAL:               {fmt_moeda(cen['custo_total'])}\n", "highlight")
+            escrever(f"   • ROI:                 {cen['roi']:.1f}%\n", "normal")
+            escrever(f"   • Custo Prod.:         {fmt_moeda(cen['custo_kg_produzido'])}/kg (Venda: {fmt_moeda(esp['valor_mercado_kg'])})\n", "normal")
+
+            escrever(f"\n2. ORÇAMENTO (DESTINAÇÃO DO CAPITAL)\n{'-'*80}\n", "header")
+            escrever(f"   • Alevinos:            {fmt_num(cen['qtd_povoamento'])} un. -> {fmt_moeda(cen['custo_alevinos'])}\n", "normal")
+            escrever(f"   • Ração:               {cen['racao_ton']:.2f} ton -> {fmt_moeda(cen['custo_racao'])}\n", "normal")
+            escrever(f"   • Custo Fixo:          {fmt_moeda(cen['custo_fixo'])}\n", "normal")
+            escrever(f"   ► TOTAL:               {fmt_moeda(cen['custo_total'])}\n", "highlight")
             if cen['custo_total'] < sis.capital_giro:
-                self.results_text.insert(tk.END, f"     (Sobra de Caixa: {fmt_moeda(sis.capital_giro - cen['custo_total'])})\n", "normal")
+                escrever(f"     (Sobra de Caixa: {fmt_moeda(sis.capital_giro - cen['custo_total'])})\n", "normal")
 
-            self.results_text.insert(tk.END, f"\n3. SEGURANÇA (PONTO DE EQUILÍBRIO)\n{'-'*80}\n", "header")
-            self.results_text.insert(tk.END, f"   Precisa produzir {fmt_num(cen['ponto_equilibrio'])} kg para pagar contas.\n", "normal")
-            self.results_text.insert(tk.END, f"   Projeção atual:  {fmt_num(cen['biomassa_kg'])} kg.\n", "highlight")
+            escrever(f"\n3. SEGURANÇA (PONTO DE EQUILÍBRIO)\n{'-'*80}\n", "header")
+            escrever(f"   Precisa produzir {fmt_num(cen['ponto_equilibrio'])} kg para pagar contas.\n", "normal")
+            escrever(f"   Projeção atual:  {fmt_num(cen['biomassa_kg'])} kg.\n", "highlight")
 
-            self.results_text.insert(tk.END, f"\n4. DIAGNÓSTICO DE INFRAESTRUTURA\n{'-'*80}\n", "header")
-            self.results_text.insert(tk.END, f"   • Ocupação Tanques: {cen['ocupacao']:.1f}%\n", "normal")
+            escrever(f"\n4. DIAGNÓSTICO DE INFRAESTRUTURA\n{'-'*80}\n", "header")
+            escrever(f"   • Ocupação Tanques: {cen['ocupacao']:.1f}%\n", "normal")
             msg_gargalo = "Falta Dinheiro (Tanques ociosos)" if cen['gargalo'] == 'FINANCEIRO' else "Falta Espaço (Dinheiro sobrando)"
-            self.results_text.insert(tk.END, f"   • Gargalo Principal: {msg_gargalo}\n", "normal")
-            self.results_text.insert(tk.END, "\n")
+            escrever(f"   • Gargalo Principal: {msg_gargalo}\n", "normal")
+            escrever("\n")
 
-        # Chama a função de Otimização (Simplex)
-        # Passamos a 'meta_kg' como argumento posicional (ela entra no meta_minima_kg da função)
-        opt = otimizar_mix_ideal(sis, self.especies_db, meta_kg)
-        
-        self.results_text.insert(tk.END, f"\n{'#'*80}\n", "highlight")
+        # Resultado da Otimização (Simplex), já calculado em segundo plano
+        escrever(f"\n{'#'*80}\n", "highlight")
         meta_txt = f"{fmt_num(meta_kg)} kg" if meta_kg > 0 else "NÃO DEFINIDA (Livre)"
-        self.results_text.insert(tk.END, f"   CONCLUSÃO ESTRATÉGICA: MIX IDEAL (Meta: {meta_txt})\n", "header")
-        self.results_text.insert(tk.END, f"{'#'*80}\n", "highlight")
+        escrever(f"   CONCLUSÃO ESTRATÉGICA: MIX IDEAL (Meta: {meta_txt})\n", "header")
+        escrever(f"{'#'*80}\n", "highlight")
 
         if opt['status'] == 'ÓTIMO':
-            self.results_text.insert(tk.END, f"\n Para atingir a meta lucrando o máximo possível, sugere-se:\n", "normal")
+            escrever(f"\n Para atingir a meta lucrando o máximo possível, sugere-se:\n", "normal")
             for item in opt['mix']:
-                self.results_text.insert(tk.END, f"   ► {item['qtd']:>5} un. de {item['especie']:<20} (Ciclo: {item['ciclo']} meses)\n", "highlight")
+                escrever(f"   ► {item['qtd']:>5} un. de {item['especie']:<20} (Ciclo: {item['ciclo']:.0f} meses)\n", "highlight")
             
-            self.results_text.insert(tk.END, f"\n   • Produção Total:      {fmt_num(opt['biomassa_total'])} kg\n", "header")
-            self.results_text.insert(tk.END, f"   • Lucro Total (Ciclo): {fmt_moeda(opt['lucro_total'])}\n", "header")
-            self.results_text.insert(tk.END, f"   • Payback Estimado:    {opt['payback_meses']:.1f} meses\n", "header")
+            escrever(f"\n   • Produção Total:      {fmt_num(opt['biomassa_total'])} kg\n", "header")
+            escrever(f"   • Lucro Total (Ciclo): {fmt_moeda(opt['lucro_total'])}\n", "header")
+            escrever(f"   • Payback Estimado:    {opt['payback_meses']:.1f} meses\n", "header")
         
         elif opt['status'] == 'IMPOSSÍVEL':
-            self.results_text.insert(tk.END, f"\n [!] IMPOSSÍVEL ATINGIR A META COM OS RECURSOS ATUAIS.\n", "negative")
-            self.results_text.insert(tk.END, f"     Tente reduzir a meta ou aumentar o capital.\n", "normal")
+            escrever(f"\n [!] IMPOSSÍVEL ATINGIR A META COM OS RECURSOS ATUAIS.\n", "negative")
+            escrever(f"     Tente reduzir a meta ou aumentar o capital.\n", "normal")
         
-        self.results_text.insert(tk.END, f"\n{'='*80}\n", "title")
+        escrever(f"\n{'='*80}\n", "title")
+        self._mostrar_relatorio(buf.getvalue(), marcas)
+
+    def _mostrar_relatorio(self, texto, marcas):
+        """Troca o conteúdo da caixa de relatório com um único insert."""
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert('1.0', texto)
+        for tag, inicio, fim in marcas:
+            self.results_text.tag_add(tag, f'1.0+{inicio}c', f'1.0+{fim}c')
         self.results_text.config(state=tk.DISABLED)
 
 if __name__ == "__main__":